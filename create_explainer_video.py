@@ -6,72 +6,160 @@ Combines text analysis, image generation, and asset preparation for video creati
 
 import os
 import asyncio
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from video_explainer_generator import VideoExplainerGenerator
-from image_generator import ImageGenerator
-from tts_processor import TTSProcessor
 from job_manager import InfographicJobManager
-from video_compiler import VideoCompiler
 from storage_service import upload_to_spaces, cleanup_local_folder
 import time
 
+# orjson serializes several times faster than the stdlib encoder and writes
+# bytes directly; fall back to json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Static part of the fallback overlay coordinates; only the text varies
+_DEFAULT_COORDS_TEMPLATE = {"x": 100, "y": 100, "width": 600, "height": 120}
+
+
+def _extract_json_array(text):
+    """Return the first balanced top-level JSON array in text, or None.
+
+    Replaces a greedy DOTALL regex scan: walks the string once, tracking
+    bracket depth and skipping over quoted strings (with escapes).
+    """
+    start = text.find('[')
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 class ExplainerVideoCreator:
     def create_text_overlay_coordinate_files(self, script):
         """
         For each segment, generate a file with overlay text and coordinates for the corresponding image using Gemini.
         Returns a list of generated JSON file paths.
         """
+        # Deferred: image_generator pulls in playwright
         from image_generator import gemini_image_prompt
-        import json
-        import re
         overlay_coord_files = []
+
+        # Collect the work items first, then fan the network-bound Gemini
+        # calls out across threads; parsing and file writes stay sequential
+        work_items = []
         for segment in script['segments']:
             segment_num = segment['segment_number']
             overlay_text = segment.get('text_overlay', '')
             image_path = segment.get('background_image', '')
+            if overlay_text and image_path:
+                work_items.append((segment, segment_num, overlay_text, image_path))
+
+        if not work_items:
+            return overlay_coord_files
+
+        # EAFP: rather than stat()-ing every image up front, let the call
+        # fail for missing files and skip those segments
+        _missing = object()
+
+        def fetch_coords(item):
+            try:
+                return gemini_image_prompt(item[3], item[2])
+            except (FileNotFoundError, OSError) as e:
+                print(f"⚠️  Skipping overlay coordinates for segment {item[1]}: {e}")
+                return _missing
+
+        with ThreadPoolExecutor(max_workers=min(8, len(work_items))) as executor:
+            responses = list(executor.map(fetch_coords, work_items))
+
+        for (segment, segment_num, overlay_text, image_path), coords_text in zip(work_items, responses):
+            if coords_text is _missing:
+                continue
             coords = None
-            if overlay_text and image_path and os.path.exists(image_path):
-                # Call Gemini API for coordinates (multi-part)
-                coords_text = gemini_image_prompt(image_path, overlay_text)
-                coords = None
-                if coords_text:
-                    try:
-                        # Extract JSON array from response
-                        match = re.search(r'\[.*\]', coords_text, re.DOTALL)
-                        if match:
-                            coords = json.loads(match.group(0))
-                    except Exception:
-                        pass
-                if not coords or not isinstance(coords, list):
-                    print(f"⚠️  Falling back to default coordinates for segment {segment_num}")
-                    # Fallback: treat the whole overlay as one part
-                    coords = [{
-                        "text": overlay_text,
-                        "x": 100, "y": 100, "width": 600, "height": 120
-                    }]
-                overlay_coord = {
-                    "segment_number": segment_num,
-                    "title": segment.get('title', ''),
-                    "overlay_text": overlay_text,
-                    "coordinates": coords,
-                    "background_image": image_path
-                }
-                coord_file = self.output_dir / f"segment_{segment_num:02d}_overlay_coords.json"
+            if coords_text:
+                try:
+                    # Extract JSON array from response
+                    payload = _extract_json_array(coords_text)
+                    if payload:
+                        coords = json.loads(payload)
+                except Exception:
+                    pass
+            if not coords or not isinstance(coords, list):
+                print(f"⚠️  Falling back to default coordinates for segment {segment_num}")
+                # Fallback: treat the whole overlay as one part
+                coords = [{"text": overlay_text, **_DEFAULT_COORDS_TEMPLATE}]
+            overlay_coord = {
+                "segment_number": segment_num,
+                "title": segment.get('title', ''),
+                "overlay_text": overlay_text,
+                "coordinates": coords,
+                "background_image": image_path
+            }
+            coord_file = self.output_dir / f"segment_{segment_num:02d}_overlay_coords.json"
+            if orjson is not None:
+                coord_file.write_bytes(orjson.dumps(overlay_coord, option=orjson.OPT_INDENT_2))
+            else:
                 with open(coord_file, 'w', encoding='utf-8') as f:
                     json.dump(overlay_coord, f, indent=2, ensure_ascii=False)
-                overlay_coord_files.append(str(coord_file))
-                print(f"✅ Created overlay coordinate file: {coord_file}")
+            overlay_coord_files.append(str(coord_file))
+            print(f"✅ Created overlay coordinate file: {coord_file}")
         return overlay_coord_files
     """Complete pipeline for creating explainer video assets"""
     
     def __init__(self, output_dir=None):
         self.output_dir = Path(output_dir) if output_dir else Path("video_segments")
         self.video_generator = VideoExplainerGenerator(self.output_dir)
-        self.image_generator = ImageGenerator(self.output_dir)
-        self.tts_processor = TTSProcessor(self.output_dir)
-        self.video_compiler = VideoCompiler(self.output_dir)
-        
+        # The image/TTS/compiler components pull in heavy dependencies
+        # (playwright, TTS SDKs, ffmpeg helpers); import and build them on
+        # first use so --no-tts / --no-video runs skip the cost entirely
+        self._image_generator = None
+        self._tts_processor = None
+        self._video_compiler = None
+
+    @property
+    def image_generator(self):
+        if self._image_generator is None:
+            from image_generator import ImageGenerator
+            self._image_generator = ImageGenerator(self.output_dir)
+        return self._image_generator
+
+    @property
+    def tts_processor(self):
+        if self._tts_processor is None:
+            from tts_processor import TTSProcessor
+            self._tts_processor = TTSProcessor(self.output_dir)
+        return self._tts_processor
+
+    @property
+    def video_compiler(self):
+        if self._video_compiler is None:
+            from video_compiler import VideoCompiler
+            self._video_compiler = VideoCompiler(self.output_dir)
+        return self._video_compiler
+
     def create_complete_video_assets(self, text_content, target_duration=60, segments_count=None, 
                                    enable_tts=True, tts_service='gtts', tts_kwargs=None):
         """
@@ -167,7 +255,6 @@ class ExplainerVideoCreator:
 
         # ✅ Step 8: Upload to DigitalOcean Spaces & Cleanup
         try:
-            from storage_service import upload_to_spaces, cleanup_local_folder
             if final_video and os.path.exists(final_video):
                 job_id = int(time.time())
                 object_name = f"videos/{job_id}/{Path(final_video).name}"
@@ -200,12 +287,14 @@ class ExplainerVideoCreator:
             
             if overlay_text:
                 overlay_file = self.output_dir / f"segment_{segment_num:02d}_overlay.txt"
-                
-                with open(overlay_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# Text Overlay for Segment {segment_num}\n")
-                    f.write(f"# Title: {segment['title']}\n\n")
-                    f.write(overlay_text)
-                
+
+                body = (
+                    f"# Text Overlay for Segment {segment_num}\n"
+                    f"# Title: {segment['title']}\n\n"
+                    f"{overlay_text}"
+                )
+                overlay_file.write_text(body, encoding='utf-8')
+
                 overlay_files.append(str(overlay_file))
                 print(f"✅ Created overlay text: {overlay_file}")
         
@@ -214,40 +303,47 @@ class ExplainerVideoCreator:
     def create_narration_files(self, script):
         """Create narration script files for TTS"""
         narration_files = []
-        
-        # Individual segment narrations
+
+        # Accumulate the complete script while writing the per-segment files
+        # so the segments are only iterated once
+        complete_parts = [
+            "# Complete Video Narration Script\n",
+            f"# Total Duration: {script['video_metadata']['estimated_duration']} seconds\n\n",
+        ]
+
         for segment in script['segments']:
             segment_num = segment['segment_number']
             narration_text = segment.get('narration_text', '')
-            
+            duration = segment.get('duration_seconds', 6)
+
             narration_file = self.output_dir / f"segment_{segment_num:02d}_narration.txt"
-            
-            with open(narration_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Narration for Segment {segment_num}\n")
-                f.write(f"# Title: {segment['title']}\n")
-                f.write(f"# Duration: {segment.get('duration_seconds', 6)} seconds\n\n")
-                f.write(narration_text)
-            
+
+            body = (
+                f"# Narration for Segment {segment_num}\n"
+                f"# Title: {segment['title']}\n"
+                f"# Duration: {duration} seconds\n\n"
+                f"{narration_text}"
+            )
+            narration_file.write_text(body, encoding='utf-8')
+
             narration_files.append(str(narration_file))
             print(f"✅ Created narration script: {narration_file}")
-        
+
+            complete_parts.append(
+                f"## Segment {segment_num}: {segment['title']}\n"
+                f"Duration: {duration} seconds\n"
+                f"Timing: {segment['timing']['start_time']}s - {segment['timing']['end_time']}s\n\n"
+                f"{narration_text}\n\n"
+                + "-" * 50 + "\n\n"
+            )
+
         # Complete narration script
         complete_narration = self.output_dir / "complete_narration.txt"
-        
-        with open(complete_narration, 'w', encoding='utf-8') as f:
-            f.write("# Complete Video Narration Script\n")
-            f.write(f"# Total Duration: {script['video_metadata']['estimated_duration']} seconds\n\n")
-            
-            for segment in script['segments']:
-                f.write(f"## Segment {segment['segment_number']}: {segment['title']}\n")
-                f.write(f"Duration: {segment.get('duration_seconds', 6)} seconds\n")
-                f.write(f"Timing: {segment['timing']['start_time']}s - {segment['timing']['end_time']}s\n\n")
-                f.write(f"{segment.get('narration_text', '')}\n\n")
-                f.write("-" * 50 + "\n\n")
-        
+        complete_narration.write_text(''.join(complete_parts), encoding='utf-8')
+
         narration_files.append(str(complete_narration))
         print(f"✅ Created complete narration: {complete_narration}")
-        
+
         return narration_files
     
     def generate_audio_from_narrations(self, tts_service='gtts', tts_kwargs=None):
@@ -313,104 +409,116 @@ class ExplainerVideoCreator:
     def create_production_summary(self, script, overlay_files, narration_files, audio_files, final_video=None):
         """Create a production summary with all details and next steps"""
         summary_file = self.output_dir / "production_summary.md"
-        
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("# Explainer Video Production Summary\n\n")
-            
-            # Video metadata
-            metadata = script['video_metadata']
-            f.write("## Video Details\n")
-            f.write(f"- **Total Segments**: {metadata['total_segments']}\n")
-            f.write(f"- **Estimated Duration**: {metadata['estimated_duration']} seconds\n")
-            f.write(f"- **Created**: {metadata['created_at']}\n")
-            f.write(f"- **Format**: {metadata['format']}\n\n")
-            
-            # Segments overview
-            f.write("## Segments Overview\n\n")
-            for segment in script['segments']:
-                f.write(f"### Segment {segment['segment_number']}: {segment['title']}\n")
-                f.write(f"- **Duration**: {segment.get('duration_seconds', 6)} seconds\n")
-                f.write(f"- **Timing**: {segment['timing']['start_time']}s - {segment['timing']['end_time']}s\n")
-                f.write(f"- **Background Image**: `{Path(segment['background_image']).name}`\n")
-                f.write(f"- **Text Overlay**: {segment.get('text_overlay', 'None')}\n")
-                f.write(f"- **Narration**: {segment.get('narration_text', '')[:100]}...\n\n")
-            
-            # File assets
-            f.write("## Generated Assets\n\n")
-            f.write("### Background Images\n")
-            for segment in script['segments']:
-                f.write(f"- `{Path(segment['background_image']).name}` - Segment {segment['segment_number']}\n")
-            
-            f.write("\n### Text Overlay Files\n")
-            for overlay_file in overlay_files:
-                f.write(f"- `{Path(overlay_file).name}`\n")
-            
-            f.write("\n### Narration Scripts\n")
-            for narration_file in narration_files:
-                f.write(f"- `{Path(narration_file).name}`\n")
-            
-            f.write("\n### Audio Files\n")
-            if audio_files:
-                for audio_file in audio_files:
-                    f.write(f"- `{Path(audio_file).name}`\n")
-                f.write("\n✅ **Audio generation complete!** All narration has been converted to MP3 files.\n")
-            else:
-                f.write("- No audio files generated\n")
-                f.write("\n⚠️  **Audio generation needed** - Use TTS to convert narration scripts to audio.\n")
-            
-            # Video compilation status
-            f.write("\n### Final Video\n")
-            if final_video:
-                f.write(f"- `{Path(final_video).name}`\n")
-                f.write("\n🎉 **Video compilation complete!** Your explainer video is ready for sharing.\n")
-            else:
-                f.write("- No final video generated\n")
-                f.write("\n⚠️  **Video compilation needed** - Use the integrated video compiler.\n")
-            
-            # Next steps
-            f.write("\n## Next Steps for Video Production\n\n")
-            if final_video:
-                f.write("### 1. Review Final Video ✅\n")
-                f.write("- Watch the complete explainer video\n")
-                f.write("- Check audio synchronization with visuals\n")
-                f.write("- Verify video quality meets your standards\n\n")
-                
-                f.write("### 2. Share Your Video ✅\n")
-                f.write("- Upload to social media platforms\n")
-                f.write("- Embed in websites or presentations\n")
-                f.write("- Use in marketing campaigns\n")
-                f.write("- Further edit in video software if needed\n\n")
-            elif audio_files:
-                f.write("### 1. Review Generated Audio ✅\n")
-                f.write("- Listen to generated audio files for quality\n")
-                f.write("- Audio files are ready for video production\n\n")
-                
-                f.write("### 2. Compile Video\n")
-                f.write("```bash\n")
-                f.write("# Use the integrated video compiler\n")
-                f.write("python video_compiler.py --resolution 720p\n")
-                f.write("```\n\n")
-            else:
-                f.write("### 1. Generate Audio (TTS)\n")
-                f.write("```bash\n")
-                f.write("# Use your preferred TTS service to convert narration files to audio\n")
-                f.write("# Example with gTTS (Google Text-to-Speech):\n")
-                f.write("pip install gtts\n")
-                for segment in script['segments']:
-                    f.write(f"gtts-cli -f segment_{segment['segment_number']:02d}_narration.txt -o segment_{segment['segment_number']:02d}_audio.mp3\n")
-                f.write("```\n\n")
-            
-            f.write("### 3. Alternative: Use Video Editing Software\n")
-            f.write("- Import background images into your video editor\n")
-            f.write("- Add text overlays using the provided text files\n")
-            f.write("- Import generated audio files\n")
-            f.write("- Sync audio with visuals according to timing information\n\n")
-            
-            f.write("### 4. Recommended Tools\n")
-            f.write("- **TTS**: Google Cloud TTS, Amazon Polly, Azure Speech, or gTTS\n")
-            f.write("- **Video Editing**: FFmpeg (command line), DaVinci Resolve (free), Adobe Premiere\n")
-            f.write("- **Text Overlays**: Can be added in video editor or with FFmpeg\n")
-        
+
+        # Collect everything in a list and issue a single write at the end
+        parts = []
+        parts.append("# Explainer Video Production Summary\n\n")
+
+        # Hoist the repeatedly indexed script entries into locals
+        segments = script['segments']
+        metadata = script['video_metadata']
+
+        # Video metadata
+        parts.append("## Video Details\n")
+        parts.append(f"- **Total Segments**: {metadata['total_segments']}\n")
+        parts.append(f"- **Estimated Duration**: {metadata['estimated_duration']} seconds\n")
+        parts.append(f"- **Created**: {metadata['created_at']}\n")
+        parts.append(f"- **Format**: {metadata['format']}\n\n")
+
+        # Basenames are needed in two sections; compute them once with plain
+        # string ops instead of constructing Path objects per use
+        bg_names = [os.path.basename(s['background_image']) for s in segments]
+
+        # Segments overview
+        parts.append("## Segments Overview\n\n")
+        for i, segment in enumerate(segments):
+            num = segment['segment_number']
+            timing = segment['timing']
+            parts.append(f"### Segment {num}: {segment['title']}\n")
+            parts.append(f"- **Duration**: {segment.get('duration_seconds', 6)} seconds\n")
+            parts.append(f"- **Timing**: {timing['start_time']}s - {timing['end_time']}s\n")
+            parts.append(f"- **Background Image**: `{bg_names[i]}`\n")
+            parts.append(f"- **Text Overlay**: {segment.get('text_overlay', 'None')}\n")
+            parts.append(f"- **Narration**: {segment.get('narration_text', '')[:100]}...\n\n")
+
+        # File assets: extend with generators so the loops run at C level
+        parts.append("## Generated Assets\n\n")
+        parts.append("### Background Images\n")
+        parts.extend(f"- `{bg_names[i]}` - Segment {s['segment_number']}\n"
+                     for i, s in enumerate(segments))
+
+        parts.append("\n### Text Overlay Files\n")
+        parts.extend(f"- `{os.path.basename(p)}`\n" for p in overlay_files)
+
+        parts.append("\n### Narration Scripts\n")
+        parts.extend(f"- `{os.path.basename(p)}`\n" for p in narration_files)
+
+        parts.append("\n### Audio Files\n")
+        if audio_files:
+            parts.extend(f"- `{os.path.basename(p)}`\n" for p in audio_files)
+            parts.append("\n✅ **Audio generation complete!** All narration has been converted to MP3 files.\n")
+        else:
+            parts.append("- No audio files generated\n")
+            parts.append("\n⚠️  **Audio generation needed** - Use TTS to convert narration scripts to audio.\n")
+
+        # Video compilation status
+        parts.append("\n### Final Video\n")
+        if final_video:
+            parts.append(f"- `{os.path.basename(final_video)}`\n")
+            parts.append("\n🎉 **Video compilation complete!** Your explainer video is ready for sharing.\n")
+        else:
+            parts.append("- No final video generated\n")
+            parts.append("\n⚠️  **Video compilation needed** - Use the integrated video compiler.\n")
+
+        # Next steps
+        parts.append("\n## Next Steps for Video Production\n\n")
+        if final_video:
+            parts.append("### 1. Review Final Video ✅\n")
+            parts.append("- Watch the complete explainer video\n")
+            parts.append("- Check audio synchronization with visuals\n")
+            parts.append("- Verify video quality meets your standards\n\n")
+
+            parts.append("### 2. Share Your Video ✅\n")
+            parts.append("- Upload to social media platforms\n")
+            parts.append("- Embed in websites or presentations\n")
+            parts.append("- Use in marketing campaigns\n")
+            parts.append("- Further edit in video software if needed\n\n")
+        elif audio_files:
+            parts.append("### 1. Review Generated Audio ✅\n")
+            parts.append("- Listen to generated audio files for quality\n")
+            parts.append("- Audio files are ready for video production\n\n")
+
+            parts.append("### 2. Compile Video\n")
+            parts.append("```bash\n")
+            parts.append("# Use the integrated video compiler\n")
+            parts.append("python video_compiler.py --resolution 720p\n")
+            parts.append("```\n\n")
+        else:
+            parts.append("### 1. Generate Audio (TTS)\n")
+            parts.append("```bash\n")
+            parts.append("# Use your preferred TTS service to convert narration files to audio\n")
+            parts.append("# Example with gTTS (Google Text-to-Speech):\n")
+            parts.append("pip install gtts\n")
+            parts.append('\n'.join(
+                f"gtts-cli -f segment_{s['segment_number']:02d}_narration.txt -o segment_{s['segment_number']:02d}_audio.mp3"
+                for s in segments
+            ) + '\n')
+            parts.append("```\n\n")
+
+        parts.append("### 3. Alternative: Use Video Editing Software\n")
+        parts.append("- Import background images into your video editor\n")
+        parts.append("- Add text overlays using the provided text files\n")
+        parts.append("- Import generated audio files\n")
+        parts.append("- Sync audio with visuals according to timing information\n\n")
+
+        parts.append("### 4. Recommended Tools\n")
+        parts.append("- **TTS**: Google Cloud TTS, Amazon Polly, Azure Speech, or gTTS\n")
+        parts.append("- **Video Editing**: FFmpeg (command line), DaVinci Resolve (free), Adobe Premiere\n")
+        parts.append("- **Text Overlays**: Can be added in video editor or with FFmpeg\n")
+
+        # Encode the flattened string once and write the bytes directly
+        summary_file.write_bytes(''.join(parts).encode('utf-8'))
+
         print(f"✅ Created production summary: {summary_file}")
         return str(summary_file)
     
@@ -420,14 +528,17 @@ class ExplainerVideoCreator:
         print("🎉 EXPLAINER VIDEO ASSETS GENERATED SUCCESSFULLY!")
         print("=" * 60)
         
+        final_video = assets.get('final_video')
+        audio_files = assets['audio_files']
+
         print(f"\n📁 **Output Directory**: {assets['output_directory']}")
         print(f"📋 **Video Script**: {Path(assets['script_file']).name}")
         print(f"🎨 **Background Images**: {len(assets['background_images'])} files")
         print(f"📝 **Text Overlays**: {len(assets['text_overlays'])} files")
         print(f"🗣️  **Narration Scripts**: {len(assets['narration_scripts'])} files")
-        print(f"🎵 **Audio Files**: {len(assets['audio_files'])} files")
-        if assets.get('final_video'):
-            print(f"🎬 **Final Video**: {Path(assets['final_video']).name}")
+        print(f"🎵 **Audio Files**: {len(audio_files)} files")
+        if final_video:
+            print(f"🎬 **Final Video**: {Path(final_video).name}")
         print(f"📊 **Production Summary**: {Path(assets['summary_file']).name}")
         
         total_duration = script['video_metadata']['estimated_duration']
@@ -435,10 +546,10 @@ class ExplainerVideoCreator:
         
         print(f"\n📋 **Next Steps**:")
         print(f"1. Review the production summary: {Path(assets['summary_file']).name}")
-        if assets.get('final_video'):
+        if final_video:
             print(f"2. 🎉 Video compilation complete - ready for sharing!")
             print(f"3. Your explainer video is ready to use!")
-        elif assets['audio_files']:
+        elif audio_files:
             print(f"2. ✅ Audio generation complete - ready for video production!")
             print(f"3. Use integrated video compiler: python video_compiler.py")
         else:
@@ -447,25 +558,76 @@ class ExplainerVideoCreator:
         print(f"4. All files are ready in: {assets['output_directory']}")
 
 
-def main():
-    """Command line interface"""
+def _build_arg_parser():
+    """Full argparse parser, built only for --help or on a parse error"""
     import argparse
-    import time
-    import uuid
-    
+
     parser = argparse.ArgumentParser(description='Create complete explainer video assets from text content')
     parser.add_argument('--no-tts', action='store_true', help='Skip TTS audio generation')
-    parser.add_argument('--tts-service', choices=['gtts', 'edge_tts', 'azure', 'simple'], 
+    parser.add_argument('--tts-service', choices=['gtts', 'edge_tts', 'azure', 'simple'],
                        default='gtts', help='TTS service to use (default: gtts)')
     parser.add_argument('--lang', default='en', help='Language code for TTS (default: en)')
     parser.add_argument('--voice', default='en-US-AriaNeural', help='Voice for TTS (default: en-US-AriaNeural)')
     parser.add_argument('--no-video', action='store_true', help='Skip video compilation')
-    parser.add_argument('--video-resolution', choices=['720p', '1080p', '4k'], 
+    parser.add_argument('--video-resolution', choices=['720p', '1080p', '4k'],
                        default='720p', help='Video resolution (default: 720p)')
     parser.add_argument('--video-fps', type=int, default=30, help='Video frame rate (default: 30)')
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def _parse_cli_args(argv):
+    """Hand-rolled argv scan for the common invocation path.
+
+    argparse imports gettext/textwrap and builds a parser tree on every
+    startup; the flag schema here is small enough to walk argv directly.
+    --help and malformed input fall back to the argparse parser so usage
+    output and error messages stay unchanged.
+    """
+    from types import SimpleNamespace
+
+    args = SimpleNamespace(no_tts=False, tts_service='gtts', lang='en',
+                           voice='en-US-AriaNeural', no_video=False,
+                           video_resolution='720p', video_fps=30)
+    # flag -> (attribute, allowed values or None, converter)
+    value_flags = {
+        '--tts-service': ('tts_service', {'gtts', 'edge_tts', 'azure', 'simple'}, str),
+        '--lang': ('lang', None, str),
+        '--voice': ('voice', None, str),
+        '--video-resolution': ('video_resolution', {'720p', '1080p', '4k'}, str),
+        '--video-fps': ('video_fps', None, int),
+    }
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-h', '--help'):
+            _build_arg_parser().parse_args(['--help'])
+        elif arg == '--no-tts':
+            args.no_tts = True
+        elif arg == '--no-video':
+            args.no_video = True
+        elif arg in value_flags:
+            attr, allowed, convert = value_flags[arg]
+            try:
+                value = convert(argv[i + 1])
+            except (IndexError, ValueError):
+                return _build_arg_parser().parse_args(argv)
+            if allowed is not None and value not in allowed:
+                return _build_arg_parser().parse_args(argv)
+            setattr(args, attr, value)
+            i += 1
+        else:
+            # Unknown flag: let argparse produce the usual error
+            return _build_arg_parser().parse_args(argv)
+        i += 1
+
+    return args
+
+
+def main():
+    """Command line interface"""
+    args = _parse_cli_args(sys.argv[1:])
+
     # Use the job manager to create a new structured job folder
     job_manager = InfographicJobManager(base_dir="generated_videos")
     job_id, job_output_dir = job_manager.create_new_job(topic="explainer_video")
@@ -493,13 +655,17 @@ def main():
     # Get user text input
     print("Enter your text content (press Ctrl+D or Ctrl+Z when done):")
     print("(Or paste your content and press Enter twice)")
-    
-    text_lines = []
-    empty_line_count = 0
-    
-    try:
-        while True:
-            line = input()
+
+    stdin_answers = []
+    if not sys.stdin.isatty():
+        # Piped/redirected input: one buffered read, then the same protocol
+        # as the interactive loop — content runs until two blank lines (or
+        # EOF), and any remaining lines answer the duration/segment prompts
+        piped_lines = iter(sys.stdin.read().splitlines())
+        text_lines = []
+        empty_line_count = 0
+
+        for line in piped_lines:
             if line.strip() == "":
                 empty_line_count += 1
                 if empty_line_count >= 2:  # Two empty lines = done
@@ -507,25 +673,50 @@ def main():
             else:
                 empty_line_count = 0
                 text_lines.append(line)
-    except EOFError:
-        # Ctrl+D pressed
-        pass
-    
-    user_text = "\n".join(text_lines).strip()
-    
+
+        user_text = "\n".join(text_lines).strip()
+        stdin_answers = [line.strip() for line in piped_lines]
+    else:
+        text_lines = []
+        empty_line_count = 0
+
+        try:
+            while True:
+                line = input()
+                if line.strip() == "":
+                    empty_line_count += 1
+                    if empty_line_count >= 2:  # Two empty lines = done
+                        break
+                else:
+                    empty_line_count = 0
+                    text_lines.append(line)
+        except EOFError:
+            # Ctrl+D pressed
+            pass
+
+        user_text = "\n".join(text_lines).strip()
+
     if not user_text:
         print("No text provided. Exiting.")
         return
-    
-    # Get optional parameters
+
+    # Get optional parameters. stdin is already drained on the piped path,
+    # so prompting there would just raise EOFError — use the trailing
+    # answers (if any) instead. EOFError is also caught interactively in
+    # case the terminal closes mid-prompt.
     try:
-        duration = int(input(f"\nTarget video duration in seconds (default: 60): ") or "60")
-        segments = input("Number of segments (default: auto): ").strip()
-        segments = int(segments) if segments else None
-    except ValueError:
+        if not sys.stdin.isatty():
+            duration_answer = stdin_answers[0] if len(stdin_answers) > 0 else ""
+            segments_answer = stdin_answers[1] if len(stdin_answers) > 1 else ""
+        else:
+            duration_answer = input(f"\nTarget video duration in seconds (default: 60): ")
+            segments_answer = input("Number of segments (default: auto): ").strip()
+        duration = int(duration_answer or "60")
+        segments = int(segments_answer) if segments_answer else None
+    except (ValueError, EOFError):
         duration = 60
         segments = None
-    
+
     # Create video assets
     creator = ExplainerVideoCreator(output_dir=job_output_dir)
     
@@ -1,100 +1,421 @@
 import os
+import binascii
 import json
+import hashlib
+import math
+import shutil
+import random
+import re
 import requests
+from requests.adapters import HTTPAdapter, Retry
+import time
 from pathlib import Path
 import asyncio
-from playwright.async_api import async_playwright
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class ImageGenerator:
     API_URL = "https://dev.slidexy.net/api/vidGenImg"
+    CDP_ENDPOINT = os.environ.get("CDP_ENDPOINT", "http://localhost:9222")
+
+    # Enforce strict no-text and high-contrast constraints while keeping
+    # references enabled; constant across segments, so built once
+    CONSTRAINT_SUFFIX = """
+Constraints:
+- Do NOT include placeholders like {title}, {subtitle}, lorem ipsum, or any words/labels.
+- Maintain high contrast between foreground and background (WCAG AA ~ contrast ratio >= 4.5:1).
+- Ensure foreground never blends with background; use contrasting backplates, outlines, or shadows where needed.
+""".strip()
+
+    # Static HTML rendering needs none of Chromium's GPU/extension/IPC
+    # machinery; trimming it speeds up launch and shrinks memory
+    BROWSER_ARGS = [
+        "--no-sandbox",
+        "--disable-gpu",
+        "--disable-dev-shm-usage",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-features=IsolateOrigins,site-per-process",
+    ]
 
     def __init__(self, output_dir=None):
         self.output_dir = Path(output_dir) if output_dir else Path("video_segments")
         self.output_dir.mkdir(exist_ok=True)
+        # Rendered PNGs cached by HTML content hash: identical API output
+        # (retries, re-runs) skips the browser render entirely
+        self.render_cache_dir = self.output_dir / ".render_cache"
+        # Finished html+png pairs cached by prompt hash: a repeated prompt
+        # skips both the API call and the render on re-runs
+        self.cache_dir = self.output_dir / ".cache"
+        # Keep-alive session: reuses TCP+TLS connections across segments
+        # instead of paying a fresh handshake per API call. Transient 5xx
+        # and 429 responses are retried with backoff rather than dropping
+        # the segment on first error.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"],
+            ),
+        ))
+
+    _WS_RE = re.compile(r'\s+')
+
+    @classmethod
+    def _canonicalize(cls, prompt):
+        """Collapse runs of whitespace so incidental formatting differences
+        (line endings, indentation) can't defeat the prompt cache."""
+        return cls._WS_RE.sub(' ', prompt).strip()
+
+    @staticmethod
+    def _link_or_copy(src, dst):
+        """Hardlink dst to src so the bytes exist once on disk; fall back to
+        a plain copy on filesystems (or Windows setups) that refuse links."""
+        dst = Path(dst)
+        try:
+            if dst.exists():
+                os.unlink(dst)
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def _record_cache_entry(self, key, prompt):
+        """Append a key → prompt mapping to the cache index for inspection."""
+        index_path = self.cache_dir / "index.json"
+        try:
+            index = json.loads(index_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            index = {}
+        index[key] = {"prompt": prompt, "created": time.time()}
+        index_path.write_text(
+            json.dumps(index, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+
+    # Every render measures its element at this size before the viewport is
+    # shrunk for capture; pooled pages are restored to it between renders
+    DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
 
-    async def render_html_to_png(self, html_content, output_path):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.set_content(html_content, wait_until="networkidle")
+    # Enforce square corners; inlined into the HTML before set_content so
+    # the page lays out once instead of restyling after load
+    _CORNER_STYLE = "<style>body > div:first-of-type { border-radius: 0 !important; }</style>"
+
+    @staticmethod
+    async def _block_external_requests(page):
+        """Abort every subresource fetch: the infographic HTML is expected to
+        be self-contained, so remote fonts/scripts/analytics only add wait."""
+        async def _gate(route):
+            request = route.request
+            if request.url.startswith("data:") or request.resource_type == "document":
+                await route.continue_()
+            else:
+                await route.abort()
+
+        await page.route("**/*", _gate)
+
+    async def _new_pooled_page(self, context):
+        """Create a pool entry: a routed page plus its reusable CDP session.
+
+        Attaching the session once here keeps captures from paying an
+        attach round-trip per render and from piling sessions onto the
+        long-lived pages."""
+        page = await context.new_page()
+        await self._block_external_requests(page)
+        cdp = await context.new_cdp_session(page)
+        return page, cdp
+
+    async def render_html_to_png(self, page_pool, html_content, output_path):
+        if "</head>" in html_content:
+            html_content = html_content.replace("</head>", f"{self._CORNER_STYLE}</head>", 1)
+        else:
+            html_content = f"{self._CORNER_STYLE}{html_content}"
+
+        page, cdp = await page_pool.get()
+        try:
+            # The API returns self-contained HTML with no XHRs to settle, so
+            # waiting for network idle only adds dead time per segment
+            await page.set_content(html_content, wait_until="domcontentloaded")
 
             # Target main infographic wrapper
             element = await page.query_selector("body > div:first-of-type")
             if not element:
                 raise ValueError("❌ No infographic element found in HTML")
 
-            # Optional: enforce square corners
-            await page.add_style_tag(content="body > div:first-of-type { border-radius: 0 !important; }")
+            # Capture via CDP directly: element.screenshot() routes the PNG
+            # through the driver process, which adds serialization overhead
+            box = await element.bounding_box()
+            if not box:
+                raise ValueError("❌ Infographic element has no bounding box")
 
-            await element.screenshot(path=str(output_path))
-            await browser.close()
+            # Shrink the viewport to the element so Chromium rasters only
+            # the pixels the clipped capture will actually use
+            await page.set_viewport_size({
+                "width": max(1, math.ceil(box["width"])),
+                "height": max(1, math.ceil(box["height"])),
+            })
+            box = await element.bounding_box() or box
 
-    async def generate_images_for_script(self, script_path):
-        print("🎨 GENERATING INFOGRAPHIC IMAGES")
-        print("=" * 40)
-
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script = json.load(f)
+            result = await cdp.send("Page.captureScreenshot", {
+                "format": "png",
+                "clip": {
+                    "x": box["x"],
+                    "y": box["y"],
+                    "width": box["width"],
+                    "height": box["height"],
+                    "scale": 1,
+                },
+                "captureBeyondViewport": True,
+            })
+            # binascii decodes without base64's validation/cleanup passes.
+            # Decoding in 65532-byte chunks (a multiple of 4, so each chunk
+            # is whole base64 groups) keeps peak memory at one chunk instead
+            # of payload + decoded copy, and overlaps decode with disk write.
+            # Written via tmp + os.replace: output_path may be hardlinked
+            # into the caches from an earlier run, and truncating it in
+            # place would silently rewrite those cache entries under their
+            # old keys. Replacing swaps in a fresh inode instead.
+            data_b = result["data"].encode('ascii')
+            tmp_path = Path(f"{output_path}.tmp")
+            with open(tmp_path, "wb") as f_png:
+                for i in range(0, len(data_b), 65532):
+                    f_png.write(binascii.a2b_base64(data_b[i:i + 65532]))
+            os.replace(tmp_path, output_path)
+        finally:
+            try:
+                # Drop the segment DOM before returning the page to the pool
+                # so idle pages don't hold large documents in memory, and
+                # undo the capture-time viewport shrink — otherwise the next
+                # segment would lay out at this segment's element size
+                await page.set_content("<html></html>")
+                await page.set_viewport_size(self.DEFAULT_VIEWPORT)
+            except Exception:
+                # The page's renderer is gone — likely the same failure that
+                # aborted the render. Swap in a fresh page so the pool never
+                # shrinks; losing entries would eventually leave every
+                # render worker blocked on page_pool.get() forever.
+                try:
+                    page, cdp = await self._new_pooled_page(page.context)
+                    print("🔁 Replaced a crashed render page in the pool")
+                except Exception as pool_error:
+                    # Couldn't replace it either (browser down?) — re-queue
+                    # the old page so workers fail loudly instead of hanging
+                    print(f"⚠️  Could not replace crashed render page: {pool_error}")
+            finally:
+                await page_pool.put((page, cdp))
 
-        segments = script.get('segments', [])
-        success_count = 0
+    async def _fetch_segment_html(self, segment):
+        """Request infographic HTML for one segment (producer side).
 
-        for segment in segments:
-            segment_num = segment['segment_number']
-            title = segment['title']
+        Returns a dict whose 'status' is 'cached' (finished files copied
+        from the prompt cache), 'fetched' (HTML ready to render), or
+        'failed'.
+        """
+        segment_num = segment['segment_number']
+        title = segment['title']
 
-            print(f"\n Generating infographic for Segment {segment_num}: {title}")
+        print(f"\n Generating infographic for Segment {segment_num}: {title}")
 
-            image_prompt = segment.get('image_prompt', '')
-            print(f"📝 Using prompt: {image_prompt[:100]}...")
+        image_prompt = segment.get('image_prompt', '')
+        print(f"📝 Using prompt: {image_prompt[:100]}...")
 
-            # Enforce strict no-text and high-contrast constraints while keeping references enabled
-            constraint_suffix = """
-Constraints:
-- Do NOT include placeholders like {title}, {subtitle}, lorem ipsum, or any words/labels.
-- Maintain high contrast between foreground and background (WCAG AA ~ contrast ratio >= 4.5:1).
-- Ensure foreground never blends with background; use contrasting backplates, outlines, or shadows where needed.
-""".strip()
+        # The canonical form is both the API payload and the cache key, so
+        # whitespace-only edits to a script hit the cache instead of the API
+        final_prompt = self._canonicalize(f"{image_prompt}\n\n{self.CONSTRAINT_SUFFIX}")
 
-            final_prompt = f"{image_prompt}\n\n{constraint_suffix}"
+        output_path = self.output_dir / f"segment_{segment_num:02d}_background.png"
+        html_path = self.output_dir / f"segment_{segment_num:02d}_background.html"
 
-            output_path = self.output_dir / f"segment_{segment_num:02d}_background.png"
+        cache_key = hashlib.sha256(final_prompt.encode('utf-8')).hexdigest()
+        cached_key_png = self.cache_dir / f"{cache_key}.png"
+        cached_key_html = self.cache_dir / f"{cache_key}.html"
+        if cached_key_png.exists() and cached_key_html.exists():
+            self._link_or_copy(cached_key_png, output_path)
+            self._link_or_copy(cached_key_html, html_path)
+            print(f"♻️  Reused cached infographic for segment {segment_num}")
+            return {'status': 'cached', 'segment_num': segment_num,
+                    'output_path': output_path}
 
-            try:
-                response = requests.post(
-                    self.API_URL,
-                    json={"prompt": final_prompt, "useReferences": True},
-                    timeout=60
-                )
-                print(f"📡 API Status: {response.status_code}")
+        try:
+            # requests is blocking; run it off the event loop so other
+            # segments keep progressing. Timeouts are not covered by the
+            # adapter's Retry, so retry them here with jittered backoff.
+            for attempt in range(3):
+                try:
+                    response = await asyncio.to_thread(
+                        self.session.post,
+                        self.API_URL,
+                        json={"prompt": final_prompt, "useReferences": True},
+                        timeout=60
+                    )
+                    break
+                except requests.Timeout:
+                    if attempt == 2:
+                        raise
+                    delay = 2 ** attempt + random.random()
+                    print(f"⏳ API timeout for segment {segment_num}, retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+            print(f"📡 API Status: {response.status_code}")
+            if os.environ.get("DEBUG"):
+                # response.text decodes the full body; only pay that when
+                # someone actually wants the raw dump
                 print(f"📄 API Raw Response: {response.text[:500]}...")
-                response.raise_for_status()
+            response.raise_for_status()
+
+            data = orjson.loads(response.content) if orjson else response.json()
+            if not data.get("success") or "infographic" not in data:
+                raise ValueError(f"Unexpected API response: {data}")
+
+            return {'status': 'fetched', 'segment_num': segment_num,
+                    'output_path': output_path, 'html_path': html_path,
+                    'html_content': data["infographic"]["html"],
+                    'cache_key': cache_key, 'final_prompt': final_prompt}
+
+        except Exception as e:
+            print(f"❌ Failed to generate infographic for segment {segment_num}: {e}")
+            return {'status': 'failed', 'segment_num': segment_num,
+                    'output_path': None}
+
+    async def _render_fetched(self, page_pool, item):
+        """Render fetched HTML to PNG (consumer side).
+
+        Returns (segment_number, output_path) with output_path None on failure.
+        """
+        segment_num = item['segment_num']
+        output_path = item['output_path']
+        html_path = item['html_path']
+        html_content = item['html_content']
+
+        try:
+            # Save raw HTML (tmp + os.replace: html_path may be hardlinked
+            # into the prompt cache, which an in-place truncate would
+            # corrupt under the old key)
+            tmp_html = Path(f"{html_path}.tmp")
+            with open(tmp_html, "w", encoding="utf-8") as f_html:
+                f_html.write(html_content)
+            os.replace(tmp_html, html_path)
+            print(f"💾 Saved raw HTML → {html_path}")
+
+            # Render PNG (cached by HTML content hash)
+            render_key = hashlib.sha256(html_content.encode('utf-8')).hexdigest()[:16]
+            cached_png = self.render_cache_dir / f"{render_key}.png"
+            if cached_png.exists():
+                self._link_or_copy(cached_png, output_path)
+                print(f"♻️  Reused cached render for segment {segment_num}")
+            else:
+                await self.render_html_to_png(page_pool, html_content, output_path)
+                self.render_cache_dir.mkdir(exist_ok=True)
+                self._link_or_copy(output_path, cached_png)
+
+            # Populate the prompt cache so re-runs skip the API call too
+            self.cache_dir.mkdir(exist_ok=True)
+            self._link_or_copy(html_path, self.cache_dir / f"{item['cache_key']}.html")
+            self._link_or_copy(output_path, self.cache_dir / f"{item['cache_key']}.png")
+            self._record_cache_entry(item['cache_key'], item['final_prompt'])
+
+            print(f"✅ Saved infographic image → {output_path}")
+            return segment_num, output_path
+
+        except Exception as e:
+            print(f"❌ Failed to generate infographic for segment {segment_num}: {e}")
+            return segment_num, None
+
+    async def generate_images_for_script(self, script_path):
+        print("🎨 GENERATING INFOGRAPHIC IMAGES")
+        print("=" * 40)
+
+        raw_script = Path(script_path).read_bytes()
+        script = orjson.loads(raw_script) if orjson else json.loads(raw_script.decode('utf-8'))
+
+        segments = script.get('segments', [])
+        success_count = 0
 
-                data = response.json()
-                if not data.get("success") or "infographic" not in data:
-                    raise ValueError(f"Unexpected API response: {data}")
+        if segments:
+            # Imported on first use: pulling in playwright at module import
+            # slows down every consumer that only needs cached images
+            from playwright.async_api import async_playwright
 
-                html_content = data["infographic"]["html"]
+            # Producer/consumer pipeline: API fetches are network-bound and
+            # embarrassingly parallel, renders are browser-bound — decoupling
+            # them through a queue lets network wait overlap render work.
+            # A single Chromium is launched up front and shared by every
+            # segment — launching one per render costs ~1-2s of startup.
+            results = []
+            render_queue = asyncio.Queue()
+            fetch_semaphore = asyncio.Semaphore(min(8, len(segments)))
 
-                # Save raw HTML
-                html_path = self.output_dir / f"segment_{segment_num:02d}_background.html"
-                with open(html_path, "w", encoding="utf-8") as f_html:
-                    f_html.write(html_content)
-                print(f"💾 Saved raw HTML → {html_path}")
+            async def produce(seg):
+                async with fetch_semaphore:
+                    item = await self._fetch_segment_html(seg)
+                if item['status'] == 'fetched':
+                    await render_queue.put(item)
+                else:
+                    results.append((item['segment_num'], item['output_path']))
 
-                # Render PNG
-                await self.render_html_to_png(html_content, output_path)
+            async def render_worker(page_pool):
+                while True:
+                    item = await render_queue.get()
+                    if item is None:
+                        break
+                    results.append(await self._render_fetched(page_pool, item))
 
-                # Save path into segment
-                segment['background_image'] = str(output_path)
-                success_count += 1
-                print(f"✅ Saved infographic image → {output_path}")
+            async with async_playwright() as p:
+                # Attach to an externally managed long-lived Chrome when one
+                # is listening (chrome --headless=new --remote-debugging-port=9222)
+                # so repeated CLI runs skip the full browser bootstrap;
+                # otherwise launch our own for this run
+                try:
+                    browser = await p.chromium.connect_over_cdp(self.CDP_ENDPOINT)
+                    print(f"🔌 Attached to existing browser at {self.CDP_ENDPOINT}")
+                except Exception:
+                    browser = await p.chromium.launch(
+                        headless=True, args=self.BROWSER_ARGS, chromium_sandbox=False
+                    )
+                try:
+                    # One shared context for all segments: these renders are
+                    # stateless (no cookies/storage), so per-segment contexts
+                    # would only add setup cost. Pages stay per-segment.
+                    context = await browser.new_context(
+                        viewport=self.DEFAULT_VIEWPORT,
+                        device_scale_factor=1,
+                    )
+                    # Warm page pool: creating a renderer target per segment
+                    # costs a round-trip each time, so a fixed set of pages
+                    # is created once and rented per render
+                    worker_count = min(3, len(segments))
+                    page_pool = asyncio.Queue()
+                    for _ in range(worker_count):
+                        await page_pool.put(await self._new_pooled_page(context))
+                    workers = [asyncio.create_task(render_worker(page_pool))
+                               for _ in range(worker_count)]
+                    await asyncio.gather(*(produce(seg) for seg in segments))
+                    for _ in workers:
+                        await render_queue.put(None)
+                    await asyncio.gather(*workers)
+                finally:
+                    await browser.close()
 
-            except Exception as e:
-                print(f"❌ Failed to generate infographic for segment {segment_num}: {e}")
+            paths_by_segment = dict(results)
+            for segment in segments:
+                output_path = paths_by_segment.get(segment['segment_number'])
+                if output_path:
+                    segment['background_image'] = str(output_path)
+                    success_count += 1
 
-        with open(script_path, 'w', encoding='utf-8') as f:
-            json.dump(script, f, indent=2, ensure_ascii=False)
+        # Atomic replace so an interrupt mid-write never truncates the script
+        tmp_path = Path(f"{script_path}.tmp")
+        if orjson:
+            tmp_path.write_bytes(orjson.dumps(script, option=orjson.OPT_INDENT_2))
+        else:
+            tmp_path.write_text(
+                json.dumps(script, indent=2, ensure_ascii=False), encoding='utf-8'
+            )
+        os.replace(tmp_path, script_path)
 
         print(f"\n✅ Generated {success_count}/{len(segments)} background images")
         print(f"📁 Images saved in: {self.output_dir}")
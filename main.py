@@ -1,5 +1,8 @@
 import sys
 import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse, FileResponse
@@ -28,14 +31,52 @@ class VideoRequest(BaseModel):
     segments_count: int
 
 
-@app.post("/generate")
-def generate_video(req: VideoRequest):
+# Background workers for video generation: a render blocks for minutes, so it
+# must run off the event loop or every other request queues behind it
+executor = ThreadPoolExecutor(max_workers=2)
+jobs = {}
+
+
+def _write_job_status(job_output_dir, status):
+    """Persist job status next to its assets so polling survives restarts.
+
+    Written to a tmp sibling and os.replace'd so a concurrent /status read
+    can never see a half-written file.
+    """
+    # In production the pipeline deletes the job folder after uploading the
+    # assets, so recreate it — a success status must never fail to persist
+    # just because the folder was cleaned up
+    job_output_dir.mkdir(parents=True, exist_ok=True)
+    status_file = job_output_dir / "status.json"
+    tmp_file = job_output_dir / "status.json.tmp"
+    tmp_file.write_text(json.dumps(status, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp_file, status_file)
+
+
+def _record_job_crash(future, job_id, job_output_dir):
+    """Record an exception that escaped _run_video_job so the job can never
+    sit at 'processing' forever with its failure swallowed."""
+    exc = future.exception()
+    if exc is None:
+        return
+    status = {
+        "status": "error",
+        "job_id": job_id,
+        "message": str(exc),
+        "traceback": "".join(
+            traceback.format_exception(type(exc), exc, exc.__traceback__)
+        ),
+    }
+    jobs[job_id] = status
     try:
-        # Unique job folder
-        job_id = str(int(time.time()))
-        job_output_dir = (videos_dir / f"job_{job_id}").resolve()
-        job_output_dir.mkdir(parents=True, exist_ok=True)
+        _write_job_status(job_output_dir, status)
+    except Exception:
+        pass  # in-memory status above still reports the failure
+
 
+def _run_video_job(job_id, job_output_dir, req):
+    """Run the full pipeline for one job (worker thread)."""
+    try:
         # Initialize video creation pipeline
         creator = ExplainerVideoCreator(output_dir=job_output_dir)
 
@@ -52,30 +93,69 @@ def generate_video(req: VideoRequest):
         # Validate final video path
         if assets and assets.get("final_video") and Path(assets["final_video"]).exists():
             video_path = Path(assets["final_video"]).resolve()
-            preview_url = f"/videos/{job_output_dir.name}/{video_path.name}"
-            download_url = f"/download/{job_output_dir.name}/{video_path.name}"
-            return {
+            status = {
                 "status": "success",
                 "job_id": job_id,
-                "preview_url": preview_url,
-                "download_url": download_url,
+                "preview_url": f"/videos/{job_output_dir.name}/{video_path.name}",
+                "download_url": f"/download/{job_output_dir.name}/{video_path.name}",
             }
-
-        return JSONResponse(
-            status_code=500,
-            content={
+        else:
+            status = {
                 "status": "error",
+                "job_id": job_id,
                 "message": "Video creation failed",
                 "details": assets or "No assets returned",
-            },
-        )
+            }
 
     except Exception as e:
         traceback_str = "".join(traceback.format_exc())
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "message": str(e), "traceback": traceback_str},
-        )
+        status = {
+            "status": "error",
+            "job_id": job_id,
+            "message": str(e),
+            "traceback": traceback_str,
+        }
+
+    jobs[job_id] = status
+    _write_job_status(job_output_dir, status)
+
+
+@app.post("/generate")
+async def generate_video(req: VideoRequest):
+    # Unique job folder
+    job_id = str(int(time.time()))
+    job_output_dir = (videos_dir / f"job_{job_id}").resolve()
+    job_output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Submit now, poll completion later via /status/{job_id}
+    status = {"status": "processing", "job_id": job_id}
+    jobs[job_id] = status
+    _write_job_status(job_output_dir, status)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, _run_video_job, job_id, job_output_dir, req)
+    future.add_done_callback(
+        lambda f: _record_job_crash(f, job_id, job_output_dir)
+    )
+
+    return {
+        "status": "processing",
+        "job_id": job_id,
+        "status_url": f"/status/{job_id}",
+    }
+
+
+@app.get("/status/{job_id}")
+def job_status(job_id: str):
+    """Report job progress/result without blocking on the pipeline."""
+    status = jobs.get(job_id)
+    if status is None:
+        # Not in memory (e.g. server restarted) — fall back to the status file
+        status_file = videos_dir / f"job_{job_id}" / "status.json"
+        if not status_file.exists():
+            return JSONResponse(status_code=404, content={"error": "Job not found"})
+        status = json.loads(status_file.read_text(encoding="utf-8"))
+    return status
 
 
 # ✅ NEW: Download endpoint
@@ -6,6 +6,10 @@ Cleans narration text and generates audio files using multiple TTS services
 
 import os
 import re
+import json
+import hashlib
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 import time
@@ -18,6 +22,11 @@ class TTSProcessor:
         self.video_segments_dir = Path(video_segments_dir)
         self.audio_output_dir = self.video_segments_dir / "audio"
         self.audio_output_dir.mkdir(exist_ok=True)
+
+        # Synthesized clips are cached by content hash so identical text,
+        # service and settings reuse the previous audio instead of re-calling
+        # the TTS service
+        self.tts_cache_dir = self.video_segments_dir / "tts_cache"
         
         # TTS service configurations
         self.tts_services = {
@@ -76,8 +85,19 @@ class TTSProcessor:
         print("🧹 Cleaning narration text files...")
         
         cleaned_narrations = []
-        narration_files = list(self.video_segments_dir.glob("segment_*_narration.txt"))
-        
+        # Fixed prefix + suffix match over scandir avoids pathlib's
+        # per-entry fnmatch glob machinery
+        try:
+            with os.scandir(self.video_segments_dir) as entries:
+                narration_files = [
+                    Path(entry.path) for entry in entries
+                    if entry.name.startswith("segment_")
+                    and entry.name.endswith("_narration.txt")
+                    and entry.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            narration_files = []
+
         for narration_file in sorted(narration_files):
             print(f"📝 Processing: {narration_file.name}")
             
@@ -138,17 +158,23 @@ class TTSProcessor:
     def _generate_with_edge_tts(self, text: str, output_path: str, **kwargs) -> bool:
         """Generate audio using Microsoft Edge TTS (edge-tts)"""
         try:
+            import asyncio
             import edge_tts
-            
+
             # Get voice from kwargs or use default
             voice = kwargs.get('voice', 'en-US-AriaNeural')
-            
-            # Create TTS object
-            tts = edge_tts.Communicate(text, voice)
-            
-            # Generate and save audio
-            tts.save(output_path)
-            
+
+            # Stream audio chunks to disk as they arrive instead of
+            # buffering the whole synthesis in memory
+            async def stream_to_file():
+                communicate = edge_tts.Communicate(text, voice)
+                with open(output_path, 'wb') as fh:
+                    async for chunk in communicate.stream():
+                        if chunk["type"] == "audio":
+                            fh.write(chunk["data"])
+
+            asyncio.run(stream_to_file())
+
             # Verify file was created
             if Path(output_path).exists() and Path(output_path).stat().st_size > 0:
                 print(f"   ✅ Edge TTS: {Path(output_path).name}")
@@ -244,6 +270,13 @@ class TTSProcessor:
             print(f"   ❌ Simple Audio: Error - {e}")
             return False
     
+    def _cache_path(self, text: str, tts_service: str, kwargs: Dict) -> Path:
+        """Cache file path for a (text, service, settings) combination"""
+        key = hashlib.sha256(
+            (text + tts_service + json.dumps(kwargs, sort_keys=True)).encode('utf-8')
+        ).hexdigest()
+        return self.tts_cache_dir / f"{key}.mp3"
+
     def generate_audio_for_segment(self, narration_data: Dict, tts_service: str = 'gtts', **kwargs) -> bool:
         """
         Generate audio for a single narration segment
@@ -263,13 +296,23 @@ class TTSProcessor:
         print(f"\n🎵 Generating audio for Segment {segment_num}...")
         print(f"   📝 Text: {clean_text[:80]}...")
         print(f"   🎯 Output: {Path(output_path).name}")
-        
+
         if tts_service not in self.tts_services:
             print(f"   ❌ Unknown TTS service: {tts_service}")
             return False
-        
-        # Generate audio using selected service
-        success = self.tts_services[tts_service](clean_text, output_path, **kwargs)
+
+        # Check the cache before synthesizing
+        cache_path = self._cache_path(clean_text, tts_service, kwargs)
+        if cache_path.exists() and cache_path.stat().st_size > 0:
+            shutil.copy(cache_path, output_path)
+            print(f"   ♻️  Reused cached audio: {cache_path.name}")
+            success = True
+        else:
+            # Generate audio using selected service
+            success = self.tts_services[tts_service](clean_text, output_path, **kwargs)
+            if success and Path(output_path).exists():
+                self.tts_cache_dir.mkdir(exist_ok=True)
+                shutil.copy(output_path, cache_path)
         
         if success:
             # Update narration data with audio file info
@@ -309,12 +352,14 @@ class TTSProcessor:
             print("❌ No narration files found to process")
             return []
         
-        # Generate audio for each segment
-        success_count = 0
-        for narration_data in cleaned_narrations:
-            success = self.generate_audio_for_segment(narration_data, tts_service, **kwargs)
-            if success:
-                success_count += 1
+        # Generate audio for each segment; the TTS services are network-bound,
+        # so fan the per-segment calls out across threads
+        with ThreadPoolExecutor(max_workers=min(8, len(cleaned_narrations))) as executor:
+            results = list(executor.map(
+                lambda narration_data: self.generate_audio_for_segment(narration_data, tts_service, **kwargs),
+                cleaned_narrations
+            ))
+        success_count = sum(1 for success in results if success)
         
         # Generate complete audio file
         complete_audio_success = self._generate_complete_audio(cleaned_narrations, tts_service, **kwargs)
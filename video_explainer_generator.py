@@ -5,26 +5,58 @@ Takes text content and creates video segments with generated background images a
 """
 
 import os
+import re
 import json
 import time
+import hashlib
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+# Exact-match cache of raw Gemini responses keyed by
+# sha256(system_prompt + user_prompt + model); repeated requests for the
+# same text/duration/segment settings skip the API round-trip entirely
+_RESPONSE_CACHE = {}
+
+# .env parsing and genai.configure only need to happen once per process
+_CONFIGURED = False
+
+
+def _ensure_configured():
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise Exception("GOOGLE_API_KEY environment variable not set.")
+    genai.configure(api_key=api_key)
+    _CONFIGURED = True
+
+
+@functools.lru_cache(maxsize=8)
+def _get_model(system_prompt, model_name="gemini-2.5-flash"):
+    """Reuse GenerativeModel instances (and their transport) per prompt"""
+    return genai.GenerativeModel(model_name, system_instruction=system_prompt)
+
+
+# Leading/trailing markdown code fences (```json, ```html, bare ```)
+_FENCE_RE = re.compile(r'^\s*```(?:json|html)?\s*\n?|\n?\s*```\s*$')
+
+
+def _strip_fences(text):
+    """Remove markdown code fences the model sometimes wraps output in"""
+    return _FENCE_RE.sub('', text).strip()
+
 
 class VideoExplainerGenerator:
     """Generate explainer video segments from text content"""
     
     def __init__(self, output_dir=None):
-        # Load environment variables
-        load_dotenv()
-        
-        # Configure Gemini API
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise Exception("GOOGLE_API_KEY environment variable not set.")
-        genai.configure(api_key=api_key)
-        
+        # Load environment variables and configure Gemini (once per process)
+        _ensure_configured()
+
         # Create output directory
         self.output_dir = Path(output_dir) if output_dir else Path("video_segments")
         self.output_dir.mkdir(exist_ok=True)
@@ -99,24 +131,39 @@ class VideoExplainerGenerator:
             ]
         }
 
-        model = genai.GenerativeModel(
-            "gemini-2.5-flash",
-            system_instruction=system_prompt
-        )
-
-        response = model.generate_content(json.dumps(user_prompt, indent=2))
-        result = response.text.strip()
+        prompt_payload = json.dumps(user_prompt, indent=2)
+        cache_key = hashlib.sha256(
+            (system_prompt + "\0" + prompt_payload + "\0gemini-2.5-flash").encode('utf-8')
+        ).hexdigest()
+
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            print("♻️  Reusing cached Gemini response for identical request")
+            result = cached
+        else:
+            model = _get_model(system_prompt)
+
+            # Stream the response so tokens are consumed as they arrive
+            # instead of blocking until the full generation completes.
+            # JSON response mode keeps the model from wrapping the array
+            # in markdown fences in the first place.
+            response = model.generate_content(
+                prompt_payload,
+                generation_config=genai.types.GenerationConfig(
+                    response_mime_type="application/json"
+                ),
+                stream=True,
+            )
+            result = ''.join(chunk.text for chunk in response).strip()
+
+        # Kept pristine for caching: only inserted once parsing succeeds, so
+        # a malformed generation can't get pinned and poison every retry
+        raw_result = result
 
         print(f"🔍 Raw response length: {len(result)} characters")
 
         # Clean up JSON response - be more aggressive
-        if result.startswith("```json"):
-            result = result[7:]
-        if result.startswith("```"):
-            result = result[3:]
-        if result.endswith("```"):
-            result = result[:-3]
-        result = result.strip()
+        result = _strip_fences(result)
 
         # Find the JSON array boundaries
         start_bracket = result.find('[')
@@ -127,8 +174,6 @@ class VideoExplainerGenerator:
             result = result[start_bracket:end_bracket + 1]
 
         # Clean up common AI response issues
-        import re
-
         # Remove any standalone words that appear between JSON elements
         # This handles cases like "Tapi" appearing in the middle
         lines = result.split('\n')
@@ -148,6 +193,7 @@ class VideoExplainerGenerator:
 
         try:
             segments = json.loads(result)
+            _RESPONSE_CACHE[cache_key] = raw_result
             print(f"✅ Created {len(segments)} video segments with image prompts")
             return segments
         except json.JSONDecodeError as e:
@@ -163,12 +209,16 @@ class VideoExplainerGenerator:
                 fixed_result = re.sub(r'}\s*{', '},{', fixed_result)
 
                 segments = json.loads(fixed_result)
+                _RESPONSE_CACHE[cache_key] = raw_result
                 print(f"✅ Fixed JSON and created {len(segments)} segments")
                 return segments
             except json.JSONDecodeError as e2:
                 print(f"❌ Could not fix JSON: {e2}")
                 print(f"Final attempt - showing problematic area:")
                 print(result[max(0, len(result)//2-100):len(result)//2+100])
+                # Make sure a retry of the same text re-rolls a fresh
+                # generation instead of replaying this one
+                _RESPONSE_CACHE.pop(cache_key, None)
                 return None
     
     def enhance_single_prompt(self, original_prompt):